@@ -279,6 +279,13 @@ class LockFlags(enum.IntFlag):
     UNBLOCK = LOCK_UN
 
 
+# Plain int versions of the flags for the lock hot paths, `int & int` is
+# a lot cheaper than going through `IntFlag.__and__`
+_EXCLUSIVE = int(LockFlags.EXCLUSIVE)
+_SHARED = int(LockFlags.SHARED)
+_NON_BLOCKING = int(LockFlags.NON_BLOCKING)
+
+
 # noqa: A005
 import io
 import pathlib
@@ -364,14 +371,12 @@ class BaseLockException(Exception):  # noqa: N818
         self,
         *args: typing.Any,
         fh: typing.Union[IO, None, int, HasFileno] = None,
+        strerror: typing.Optional[str] = None,
         **kwargs: typing.Any,
     ) -> None:
         self.fh = fh
-        self.strerror = (
-            str(args[1])
-            if len(args) > 1 and isinstance(args[1], str)
-            else None
-        )
+        if strerror is not None:
+            self.strerror = strerror
         Exception.__init__(self, *args)
 
 
@@ -391,7 +396,8 @@ class FileToLarge(LockException):
 This module provides cross-platform file locking functionality.
 The Windows implementation now supports two variants:
 
-  1. A default method using the Win32 API (win32file.LockFileEx/UnlockFileEx).
+  1. A default method using the Win32 API (LockFileEx/UnlockFileEx via
+     ctypes).
   2. An alternative that uses msvcrt.locking for exclusive locks (shared
      locks still use the Win32 API).
 
@@ -402,6 +408,7 @@ backwards compatibility (POSIX) and Windows behavior.
 
 import io
 import os
+import threading
 import typing
 from typing import (
     Any,
@@ -428,6 +435,8 @@ class UnlockCallable(typing.Protocol):
 class BaseLocker:
     """Base class for locker implementations."""
 
+    __slots__ = ()
+
     def lock(self, file_obj: FileArgument, flags: LockFlags) -> None:
         """Lock the file."""
         raise NotImplementedError
@@ -453,52 +462,97 @@ LOCKER: LockerType
 
 if os.name == 'nt':  # pragma: not-posix
     # Windows-specific helper functions
-    def _prepare_windows_file(
+    def _get_windows_fd(file_obj: FileArgument) -> int:
+        """Get the fd for Windows APIs that do not use the file position."""
+        if type(file_obj) is int:
+            return file_obj
+        elif isinstance(file_obj, int):
+            # File descriptor wrapped in an int subclass
+            return int(file_obj)
+        return file_obj.fileno()  # type: ignore[union-attr]
+
+    def _prepare_msvcrt_file(
         file_obj: FileArgument,
-    ) -> tuple[int, Optional[typing.IO[Any]], Optional[int]]:
-        """Prepare file for Windows: get fd, optionally seek and save pos."""
-        if isinstance(file_obj, int):
-            # Plain file descriptor
-            return file_obj, None, None
+    ) -> tuple[int, Optional[int]]:
+        """Prepare file for msvcrt: get fd, optionally seek and save pos.
 
-        # Full IO objects (have tell/seek) -> preserve and restore position
+        `msvcrt.locking` locks from the current OS file position so for IO
+        objects the position is moved to the start of the file and restored
+        afterwards. This uses `os.lseek` on the fd directly, it does not
+        flush or discard the buffers of the IO object.
+        """
+        if type(file_obj) is int:
+            # Plain file descriptor, exact type check is the cheapest test
+            return file_obj, None
+
+        fd = _get_windows_fd(file_obj)
+        # Only full IO objects are moved, plain fds and HasFileno objects
+        # are locked from their current position
         if isinstance(file_obj, io.IOBase):
-            fd: int = file_obj.fileno()
-            original_pos = file_obj.tell()
+            original_pos = os.lseek(fd, 0, os.SEEK_CUR)
             if original_pos != 0:
-                file_obj.seek(0)
-            return fd, typing.cast(typing.IO[Any], file_obj), original_pos
-            # cast satisfies mypy: IOBase -> IO[Any]
+                os.lseek(fd, 0, os.SEEK_SET)
+                return fd, original_pos
 
-        # Fallback: an object that only implements fileno() (HasFileno)
-        fd = typing.cast(HasFileno, file_obj).fileno()  # type: ignore[redundant-cast]
-        return fd, None, None
+        return fd, None
 
     def _restore_windows_file_pos(
-        file_io_obj: Optional[typing.IO[Any]],
+        fd: int,
         original_pos: Optional[int],
     ) -> None:
-        """Restore file position if it was an IO object and pos was saved."""
-        if file_io_obj and original_pos is not None and original_pos != 0:
-            file_io_obj.seek(original_pos)
+        """Restore file position if it was moved by _prepare_msvcrt_file."""
+        if original_pos is not None:
+            os.lseek(fd, original_pos, os.SEEK_SET)
+
+    import ctypes
+    from ctypes import wintypes
+
+    # Win32 API constants used with LockFileEx/UnlockFileEx
+    _LOCKFILE_FAIL_IMMEDIATELY = 0x1
+    _LOCKFILE_EXCLUSIVE_LOCK = 0x2
+    _ERROR_LOCK_VIOLATION = 33
+    _ERROR_NOT_LOCKED = 158
+
+    # msvcrt.locking errnos that mean the file is locked by someone else
+    _MSVCRT_LOCKED_ERRNOS = frozenset((13, 16, 33, 36))
+
+    # LockFileEx flags for every combination of the relevant lock flags
+    _LOCKFILE_MODES: dict[int, int] = {
+        0: 0,
+        _EXCLUSIVE: _LOCKFILE_EXCLUSIVE_LOCK,
+        _NON_BLOCKING: _LOCKFILE_FAIL_IMMEDIATELY,
+        _EXCLUSIVE | _NON_BLOCKING: (
+            _LOCKFILE_EXCLUSIVE_LOCK | _LOCKFILE_FAIL_IMMEDIATELY
+        ),
+    }
+
+    class _OVERLAPPED(ctypes.Structure):
+        _fields_ = [
+            ('Internal', ctypes.c_void_p),
+            ('InternalHigh', ctypes.c_void_p),
+            ('Offset', wintypes.DWORD),
+            ('OffsetHigh', wintypes.DWORD),
+            ('hEvent', wintypes.HANDLE),
+        ]
 
     class Win32Locker(BaseLocker):
-        """Locker using Win32 API (LockFileEx/UnlockFileEx)."""
+        """Locker using Win32 API (LockFileEx/UnlockFileEx).
+
+        The API is called through ctypes so pywin32 is not required.
+        """
+
+        __slots__ = (
+            '_LockFileEx',
+            '_UnlockFileEx',
+            '_get_last_error',
+            '_get_osfhandle',
+            '_lock_bytes',
+            '_thread_local',
+        )
 
-        _overlapped: Any  # pywintypes.OVERLAPPED
         _lock_bytes_low: int = -0x10000
 
         def __init__(self) -> None:
-            try:
-                import pywintypes
-            except ImportError as e:
-                raise ImportError(
-                    'pywintypes is required for Win32Locker but not '
-                    'found. Please install pywin32.'
-                ) from e
-            self._overlapped = pywintypes.OVERLAPPED()
-
-        def _get_os_handle(self, fd: int) -> int:
             try:
                 import msvcrt
             except ImportError as e:
@@ -506,68 +560,105 @@ if os.name == 'nt':  # pragma: not-posix
                     'msvcrt is required for _get_os_handle on Windows '
                     'but not found.'
                 ) from e
-            return cast(int, msvcrt.get_osfhandle(fd))  # type: ignore[attr-defined,redundant-cast]
 
-        def lock(self, file_obj: FileArgument, flags: LockFlags) -> None:
-            import pywintypes
-            import win32con
-            import win32file
-            import winerror
-
-            fd, io_obj_ctx, pos_ctx = _prepare_windows_file(file_obj)
-            os_fh = self._get_os_handle(fd)
+            kernel32 = ctypes.WinDLL(  # type: ignore[attr-defined]
+                'kernel32',
+                use_last_error=True,
+            )
+            lpoverlapped = ctypes.POINTER(_OVERLAPPED)
+            self._LockFileEx = kernel32.LockFileEx
+            self._LockFileEx.argtypes = (
+                wintypes.HANDLE,
+                wintypes.DWORD,
+                wintypes.DWORD,
+                wintypes.DWORD,
+                wintypes.DWORD,
+                lpoverlapped,
+            )
+            self._LockFileEx.restype = wintypes.BOOL
+            self._UnlockFileEx = kernel32.UnlockFileEx
+            self._UnlockFileEx.argtypes = (
+                wintypes.HANDLE,
+                wintypes.DWORD,
+                wintypes.DWORD,
+                wintypes.DWORD,
+                lpoverlapped,
+            )
+            self._UnlockFileEx.restype = wintypes.BOOL
+
+            # Bound once so the hot path does not repeat the lookups
+            self._get_osfhandle = msvcrt.get_osfhandle  # type: ignore[attr-defined]
+            self._get_last_error = ctypes.get_last_error  # type: ignore[attr-defined]
+            # pywin32 takes (nNumberOfBytesToLockLow=0,
+            # nNumberOfBytesToLockHigh=-0x10000) and converts the high part
+            # to the DWORD 0xFFFF0000, which is passed as high DWORD below
+            self._lock_bytes = self._lock_bytes_low & 0xFFFFFFFF
+            # OVERLAPPED structures must not be shared between concurrent
+            # calls so every thread gets its own, see `_get_overlapped`
+            self._thread_local = threading.local()
+
+        def _get_overlapped(self) -> _OVERLAPPED:
+            overlapped = getattr(self._thread_local, 'overlapped', None)
+            if overlapped is None:
+                # Offset/OffsetHigh default to 0 and are never modified
+                overlapped = self._thread_local.overlapped = _OVERLAPPED()
+            return overlapped
 
-            mode = 0
-            if flags & LockFlags.NON_BLOCKING:
-                mode |= win32con.LOCKFILE_FAIL_IMMEDIATELY
-            if flags & LockFlags.EXCLUSIVE:
-                mode |= win32con.LOCKFILE_EXCLUSIVE_LOCK
+        def _get_os_handle(self, fd: int) -> int:
+            return self._get_osfhandle(fd)  # type: ignore[no-any-return]
 
-            try:
-                win32file.LockFileEx(
-                    os_fh, mode, 0, self._lock_bytes_low, self._overlapped
-                )
-            except pywintypes.error as exc_value:  # type: ignore[misc]
-                if exc_value.winerror == winerror.ERROR_LOCK_VIOLATION:
+        def lock(self, file_obj: FileArgument, flags: LockFlags) -> None:
+            os_fh = self._get_os_handle(_get_windows_fd(file_obj))
+
+            if not self._LockFileEx(
+                os_fh,
+                _LOCKFILE_MODES[int(flags) & (_EXCLUSIVE | _NON_BLOCKING)],
+                0,  # dwReserved
+                0,  # nNumberOfBytesToLockLow
+                self._lock_bytes,  # nNumberOfBytesToLockHigh
+                self._get_overlapped(),
+            ):
+                error = self._get_last_error()
+                exc_value = ctypes.WinError(error)  # type: ignore[attr-defined]
+                if error == _ERROR_LOCK_VIOLATION:
                     raise AlreadyLocked(
                         LockException.LOCK_FAILED,
                         exc_value.strerror,
+                        strerror=exc_value.strerror,
                         fh=file_obj,  # Pass original file_obj
                     ) from exc_value
                 else:
-                    raise
-            finally:
-                _restore_windows_file_pos(io_obj_ctx, pos_ctx)
+                    raise exc_value
 
         def unlock(self, file_obj: FileArgument) -> None:
-            import pywintypes
-            import win32file
-            import winerror
-
-            fd, io_obj_ctx, pos_ctx = _prepare_windows_file(file_obj)
-            os_fh = self._get_os_handle(fd)
-
-            try:
-                win32file.UnlockFileEx(
-                    os_fh, 0, self._lock_bytes_low, self._overlapped
-                )
-            except pywintypes.error as exc:  # type: ignore[misc]
-                if exc.winerror != winerror.ERROR_NOT_LOCKED:
+            os_fh = self._get_os_handle(_get_windows_fd(file_obj))
+
+            if not self._UnlockFileEx(
+                os_fh,
+                0,  # dwReserved
+                0,  # nNumberOfBytesToUnlockLow
+                self._lock_bytes,  # nNumberOfBytesToUnlockHigh
+                self._get_overlapped(),
+            ):
+                error = self._get_last_error()
+                if error != _ERROR_NOT_LOCKED:
+                    exc = ctypes.WinError(error)  # type: ignore[attr-defined]
                     raise LockException(
                         LockException.LOCK_FAILED,
                         exc.strerror,
+                        strerror=exc.strerror,
                         fh=file_obj,  # Pass original file_obj
                     ) from exc
-            except OSError as exc:
-                raise LockException(
-                    LockException.LOCK_FAILED,
-                    exc.strerror,
-                    fh=file_obj,  # Pass original file_obj
-                ) from exc
-            finally:
-                _restore_windows_file_pos(io_obj_ctx, pos_ctx)
 
     class MsvcrtLocker(BaseLocker):
+        __slots__ = (
+            '_LK_LOCK',
+            '_LK_NBLCK',
+            '_LK_UNLCK',
+            '_locking',
+            '_win32_locker',
+        )
+
         _win32_locker: Win32Locker
         _msvcrt_lock_length: int = 0x10000
 
@@ -580,147 +671,149 @@ if os.name == 'nt':  # pragma: not-posix
                     'msvcrt is required for MsvcrtLocker but not found.'
                 ) from e
 
-            attrs = ['LK_LOCK', 'LK_RLCK', 'LK_NBLCK', 'LK_UNLCK', 'LK_NBRLCK']
-            defaults = [0, 1, 2, 3, 2]  # LK_NBRLCK often same as LK_NBLCK (2)
-            for attr, default_val in zip(attrs, defaults):
-                if not hasattr(msvcrt, attr):
-                    setattr(msvcrt, attr, default_val)
+            # Fall back to the documented values without patching the
+            # stdlib msvcrt module itself
+            self._locking = msvcrt.locking  # type: ignore[attr-defined]
+            self._LK_LOCK: int = getattr(msvcrt, 'LK_LOCK', 1)
+            self._LK_NBLCK: int = getattr(msvcrt, 'LK_NBLCK', 2)
+            self._LK_UNLCK: int = getattr(msvcrt, 'LK_UNLCK', 0)
 
         def lock(self, file_obj: FileArgument, flags: LockFlags) -> None:
-            import msvcrt
-
-            if flags & LockFlags.SHARED:
-                win32_api_flags = LockFlags(0)
-                if flags & LockFlags.NON_BLOCKING:
-                    win32_api_flags |= LockFlags.NON_BLOCKING
-                self._win32_locker.lock(file_obj, win32_api_flags)
+            int_flags = int(flags)
+            if int_flags & _SHARED:
+                # Shared locks use the Win32 API, without EXCLUSIVE that
+                # results in a shared LockFileEx lock
+                self._win32_locker.lock(
+                    file_obj, flags & LockFlags.NON_BLOCKING
+                )
                 return
 
-            fd, io_obj_ctx, pos_ctx = _prepare_windows_file(file_obj)
+            fd, pos_ctx = _prepare_msvcrt_file(file_obj)
             mode = (
-                msvcrt.LK_NBLCK  # type: ignore[attr-defined]
-                if flags & LockFlags.NON_BLOCKING
-                else msvcrt.LK_LOCK  # type: ignore[attr-defined]
+                self._LK_NBLCK if int_flags & _NON_BLOCKING else self._LK_LOCK
             )
 
             try:
-                msvcrt.locking(  # type: ignore[attr-defined]
-                    fd,
-                    mode,
-                    self._msvcrt_lock_length,
-                )
+                self._locking(fd, mode, self._msvcrt_lock_length)
             except OSError as exc_value:
-                if exc_value.errno in (13, 16, 33, 36):
+                if exc_value.errno in _MSVCRT_LOCKED_ERRNOS:
                     raise AlreadyLocked(
                         LockException.LOCK_FAILED,
                         str(exc_value),
+                        strerror=str(exc_value),
                         fh=file_obj,  # Pass original file_obj
                     ) from exc_value
                 raise LockException(
                     LockException.LOCK_FAILED,
                     str(exc_value),
+                    strerror=str(exc_value),
                     fh=file_obj,  # Pass original file_obj
                 ) from exc_value
             finally:
-                _restore_windows_file_pos(io_obj_ctx, pos_ctx)
+                _restore_windows_file_pos(fd, pos_ctx)
 
         def unlock(self, file_obj: FileArgument) -> None:
-            import msvcrt
-
-            fd, io_obj_ctx, pos_ctx = _prepare_windows_file(file_obj)
+            fd, pos_ctx = _prepare_msvcrt_file(file_obj)
             took_fallback_path = False
 
             try:
-                msvcrt.locking(  # type: ignore[attr-defined]
-                    fd,
-                    msvcrt.LK_UNLCK,  # type: ignore[attr-defined]
-                    self._msvcrt_lock_length,
-                )
+                self._locking(fd, self._LK_UNLCK, self._msvcrt_lock_length)
             except OSError as exc:
                 if exc.errno == 13:  # EACCES (Permission denied)
                     took_fallback_path = True
                     # Restore position before calling win32_locker,
-                    # as it will re-prepare.
-                    _restore_windows_file_pos(io_obj_ctx, pos_ctx)
+                    # it does not depend on the file position.
+                    _restore_windows_file_pos(fd, pos_ctx)
                     try:
-                        self._win32_locker.unlock(
-                            file_obj
-                        )  # win32_locker handles its own seeking
+                        # Pass the fd we already have so it is not looked
+                        # up again, errors are re-raised with file_obj below
+                        self._win32_locker.unlock(fd)
                     except LockException as win32_exc:
+                        strerror = (
+                            f'msvcrt unlock failed ({exc.strerror}), and '
+                            f'win32 fallback failed ({win32_exc.strerror})'
+                        )
                         raise LockException(
                             LockException.LOCK_FAILED,
-                            f'msvcrt unlock failed ({exc.strerror}), and '
-                            f'win32 fallback failed ({win32_exc.strerror})',
+                            strerror,
+                            strerror=strerror,
                             fh=file_obj,
                         ) from win32_exc
                     except Exception as final_exc:
-                        raise LockException(
-                            LockException.LOCK_FAILED,
+                        strerror = (
                             f'msvcrt unlock failed ({exc.strerror}), and '
                             f'win32 fallback failed with unexpected error: '
-                            f'{final_exc!s}',
+                            f'{final_exc!s}'
+                        )
+                        raise LockException(
+                            LockException.LOCK_FAILED,
+                            strerror,
+                            strerror=strerror,
                             fh=file_obj,
                         ) from final_exc
                 else:
                     raise LockException(
                         LockException.LOCK_FAILED,
                         exc.strerror,
+                        strerror=exc.strerror,
                         fh=file_obj,
                     ) from exc
             finally:
                 if not took_fallback_path:
-                    _restore_windows_file_pos(io_obj_ctx, pos_ctx)
-
-    _locker_instances: dict[type[BaseLocker], BaseLocker] = dict()
-
-    LOCKER = MsvcrtLocker  # type: ignore[reportConstantRedefinition]
-
-    def lock(file: FileArgument, flags: LockFlags) -> None:
-        if isinstance(LOCKER, BaseLocker):
-            # If LOCKER is a BaseLocker instance, use its lock method
-            locker: Callable[[FileArgument, LockFlags], None] = (
-                LOCKER.lock
-            )
-        elif isinstance(LOCKER, tuple):
-            locker = LOCKER[0]  # type: ignore[reportUnknownVariableType]
-        elif issubclass(LOCKER, BaseLocker):  # type: ignore[unreachable,arg-type]  # pyright: ignore [reportUnnecessaryIsInstance]
-            locker_instance = _locker_instances.get(LOCKER)  # type: ignore[arg-type]
-            if locker_instance is None:
-                # Create an instance of the locker class if not already done
-                _locker_instances[LOCKER] = locker_instance = LOCKER()  # type: ignore[ignore,index,call-arg]
-
-            locker = locker_instance.lock
+                    _restore_windows_file_pos(fd, pos_ctx)
+
+    def _resolve_locker(
+        locker: LockerType,
+    ) -> tuple[
+        Callable[[FileArgument, LockFlags], None],
+        Callable[[FileArgument], None],
+    ]:
+        if isinstance(locker, BaseLocker):
+            # If LOCKER is a BaseLocker instance, use its lock methods
+            return locker.lock, locker.unlock
+        elif isinstance(locker, tuple):
+            return locker[0], locker[1]  # type: ignore[reportUnknownVariableType]
+        elif issubclass(locker, BaseLocker):  # type: ignore[unreachable,arg-type]  # pyright: ignore [reportUnnecessaryIsInstance]
+            # Only runs when LOCKER changes so the instance does not need to
+            # be cached separately, the bound methods keep it alive
+            locker_instance = locker()  # type: ignore[call-arg]
+            return locker_instance.lock, locker_instance.unlock
         else:
             raise TypeError(
                 f'LOCKER must be a BaseLocker instance, a tuple of lock and '
                 f'unlock functions, or a subclass of BaseLocker, '
-                f'got {type(LOCKER)}.'
+                f'got {type(locker)}.'
             )
 
-        locker(file, flags)
+    def _set_locker(locker: LockerType) -> None:
+        """Set the `LOCKER` used by `lock` and `unlock`.
 
-    def unlock(file: FileArgument) -> None:
-        if isinstance(LOCKER, BaseLocker):
-            # If LOCKER is a BaseLocker instance, use its lock method
-            unlocker: Callable[[FileArgument], None] = LOCKER.unlock
-        elif isinstance(LOCKER, tuple):
-            unlocker = LOCKER[1]  # type: ignore[reportUnknownVariableType]
-
-        elif issubclass(LOCKER, BaseLocker):  # type: ignore[unreachable,arg-type]  # pyright: ignore [reportUnnecessaryIsInstance]
-            locker_instance = _locker_instances.get(LOCKER)  # type: ignore[arg-type]
-            if locker_instance is None:
-                # Create an instance of the locker class if not already done
-                _locker_instances[LOCKER] = locker_instance = LOCKER()  # type: ignore[ignore,index,call-arg]
-
-            unlocker = locker_instance.unlock
-        else:
-            raise TypeError(
-                f'LOCKER must be a BaseLocker instance, a tuple of lock and '
-                f'unlock functions, or a subclass of BaseLocker, '
-                f'got {type(LOCKER)}.'
-            )
+        The lock and unlock callables are resolved here once instead of on
+        every `lock`/`unlock` call. Assigning to `LOCKER` directly still
+        works, it is picked up on the next `lock`/`unlock` call.
+        """
+        global LOCKER, _active_locker, _active_lock, _active_unlock
+        _active_lock, _active_unlock = _resolve_locker(locker)
+        LOCKER = _active_locker = locker  # type: ignore[reportConstantRedefinition]
+
+    LOCKER = MsvcrtLocker  # type: ignore[reportConstantRedefinition]
+
+    # The LOCKER that `_active_lock`/`_active_unlock` were resolved from.
+    # Resolution is deferred to the first call so importing this module does
+    # not instantiate a locker.
+    _active_locker: Optional[LockerType] = None
+    _active_lock: Callable[[FileArgument, LockFlags], None]
+    _active_unlock: Callable[[FileArgument], None]
+
+    def lock(file: FileArgument, flags: LockFlags) -> None:
+        if LOCKER is not _active_locker:
+            _set_locker(LOCKER)
+        _active_lock(file, flags)
 
-        unlocker(file)
+    def unlock(file: FileArgument) -> None:
+        if LOCKER is not _active_locker:
+            _set_locker(LOCKER)
+        _active_unlock(file)
 
 else:  # pragma: not-nt
     import errno
@@ -729,48 +822,58 @@ else:  # pragma: not-nt
     # PosixLocker methods accept FileArgument | HasFileno
     PosixFileArgument = Union[FileArgument, HasFileno]
 
+    # errnos that mean the file is locked by someone else
+    _POSIX_LOCKED_ERRNOS = frozenset((errno.EACCES, errno.EAGAIN))
+
     class PosixLocker(BaseLocker):
         """Locker implementation using the `LOCKER` constant"""
 
-        _locker: Optional[
-            Callable[[Union[int, HasFileno], int], Any]
-        ] = None
-
-        @property
-        def locker(self) -> Callable[[Union[int, HasFileno], int], Any]:
-            if self._locker is None:
-                # On POSIX systems ``LOCKER`` is a callable (fcntl.flock) but
-                # mypy also sees the Windows-only tuple assignment.  Explicitly
-                # cast so mypy knows we are returning the callable variant
-                # here.
-                return cast(
+        __slots__ = ('_locker',)
+
+        _locker: Callable[[Union[int, HasFileno], int], Any]
+
+        def __init__(
+            self,
+            locker: Optional[
+                Callable[[Union[int, HasFileno], int], Any]
+            ] = None,
+        ) -> None:
+            if locker is None:
+                # Subclasses can set a ``LOCKER`` class attribute, otherwise
+                # the module level ``LOCKER`` is used. On POSIX systems
+                # ``LOCKER`` is a callable (fcntl.flock) but mypy also sees
+                # the Windows-only tuple assignment so cast it explicitly.
+                locker = getattr(type(self), 'LOCKER', None) or cast(
                     Callable[[Union[int, HasFileno], int], Any], LOCKER
                 )  # pyright: ignore[reportUnnecessaryCast]
+            # Bound once here instead of resolving ``LOCKER`` on every call
+            self._locker = locker
 
-            # mypy does not realise ``self._locker`` is non-None after the
-            # check
-            assert self._locker is not None
+        @property
+        def locker(self) -> Callable[[Union[int, HasFileno], int], Any]:
             return self._locker
 
         def _get_fd(self, file_obj: PosixFileArgument) -> int:
-            if isinstance(file_obj, int):
+            if type(file_obj) is int:
                 return file_obj
-            # Check for fileno() method; covers typing.IO and HasFileno
-            elif hasattr(file_obj, 'fileno') and callable(file_obj.fileno):
-                return file_obj.fileno()
-            else:
-                # Should not be reached if PosixFileArgument is correct.
-                # isinstance(file_obj, io.IOBase) could be an
-                # alternative check
-                # but hasattr is more general for HasFileno.
+
+            # Covers typing.IO and HasFileno, only a single attribute lookup
+            # on the common path instead of hasattr + callable checks
+            try:
+                fileno = file_obj.fileno  # type: ignore[union-attr]
+            except AttributeError:
+                if isinstance(file_obj, int):
+                    return int(file_obj)
                 raise TypeError(
                     "Argument 'file_obj' must be an int, an IO object "
                     'with fileno(), or implement HasFileno.'
-                )
+                ) from None
+            return fileno()
 
         def lock(self, file_obj: PosixFileArgument, flags: LockFlags) -> None:
-            if (flags & LockFlags.NON_BLOCKING) and not flags & (
-                LockFlags.SHARED | LockFlags.EXCLUSIVE
+            int_flags = int(flags)
+            if (int_flags & _NON_BLOCKING) and not int_flags & (
+                _SHARED | _EXCLUSIVE
             ):
                 raise RuntimeError(
                     'When locking in non-blocking mode on POSIX, '
@@ -779,9 +882,9 @@ else:  # pragma: not-nt
 
             fd = self._get_fd(file_obj)
             try:
-                self.locker(fd, flags)
+                self._locker(fd, flags)
             except OSError as exc_value:
-                if exc_value.errno in (errno.EACCES, errno.EAGAIN):
+                if exc_value.errno in _POSIX_LOCKED_ERRNOS:
                     raise AlreadyLocked(
                         exc_value,
                         strerror=str(exc_value),
@@ -802,29 +905,38 @@ else:  # pragma: not-nt
 
         def unlock(self, file_obj: PosixFileArgument) -> None:
             fd = self._get_fd(file_obj)
-            self.locker(fd, LockFlags.UNBLOCK)
+            self._locker(fd, LockFlags.UNBLOCK)
 
     class FlockLocker(PosixLocker):
         """FlockLocker is a PosixLocker implementation using fcntl.flock."""
 
+        __slots__ = ()
+
         LOCKER = fcntl.flock  # type: ignore[attr-defined]
 
     class LockfLocker(PosixLocker):
         """LockfLocker is a PosixLocker implementation using fcntl.lockf."""
 
+        __slots__ = ()
+
         LOCKER = fcntl.lockf  # type: ignore[attr-defined]
 
     # LOCKER constant for POSIX is fcntl.flock for backward compatibility.
     # Type matches: Callable[[Union[int, HasFileno], int], Any]
     LOCKER = fcntl.flock  # type: ignore[attr-defined,reportConstantRedefinition]
 
-    _posix_locker_instance = PosixLocker()
+    _posix_locker_instance = PosixLocker(LOCKER)
 
     # Public API for POSIX uses the PosixLocker instance
     def lock(file: FileArgument, flags: LockFlags) -> None:
+        if _posix_locker_instance._locker is not LOCKER:
+            # ``LOCKER`` was reassigned after import
+            _posix_locker_instance._locker = LOCKER
         _posix_locker_instance.lock(file, flags)
 
     def unlock(file: FileArgument) -> None:
+        if _posix_locker_instance._locker is not LOCKER:
+            _posix_locker_instance._locker = LOCKER
         _posix_locker_instance.unlock(file)
 
 import abc
@@ -835,17 +947,39 @@ import os
 import pathlib
 import random
 import tempfile
+import threading
 import time
 import typing
+import uuid
 import warnings
 
 logger = logging.getLogger(__name__)
 
 DEFAULT_TIMEOUT = 5
 DEFAULT_CHECK_INTERVAL = 0.25
+DEFAULT_MIN_CHECK_INTERVAL = 0.001
 DEFAULT_FAIL_WHEN_LOCKED = False
+#: Number of immediate retries in `Lock.acquire` before waiting between
+#: attempts, can be overridden using the `PORTALOCKER_SPIN_COUNT` environment
+#: variable
+DEFAULT_SPIN_COUNT = 64
+with contextlib.suppress(KeyError, ValueError):
+    DEFAULT_SPIN_COUNT = max(0, int(os.environ['PORTALOCKER_SPIN_COUNT']))
 LOCK_METHOD = LockFlags.EXCLUSIVE | LockFlags.NON_BLOCKING
 
+# `msvcrt.locking` gives up on blocking locks after about 10 seconds, so on
+# Windows these are retried like non-blocking locks
+_RETRY_BLOCKING: bool = os.name == 'nt'
+
+# Windows opens in text mode unless told otherwise, `open()` always uses binary
+_O_BINARY: int = getattr(os, 'O_BINARY', 0)
+
+# Shared generator for the retry jitter, independent of the (possibly seeded)
+# global `random` state. Forked children reseed so they don't retry in step.
+_random = random.Random()
+if hasattr(os, 'register_at_fork'):  # pragma: not-nt
+    os.register_at_fork(after_in_child=_random.seed)
+
 __all__ = [
     'Lock',
     'open_atomic',
@@ -874,7 +1008,17 @@ def coalesce(*args: typing.Any, test_value: typing.Any = None) -> typing.Any:
     >>> coalesce([], dict(spam='eggs'), test_value=[])
     []
     """
-    return next((arg for arg in args if arg is not test_value), None)
+    for arg in args:
+        if arg is not test_value:
+            return arg
+    return None
+
+
+def _silent_close(fh: IO | None) -> None:  # pragma: no cover
+    # Silently try to close the handle if possible, ignore all issues
+    if fh is not None:
+        with contextlib.suppress(Exception):
+            fh.close()
 
 
 @contextlib.contextmanager
@@ -916,22 +1060,42 @@ def open_atomic(
     assert not path.exists(), f'{path!r} exists'
 
     # Create the parent directory if it doesn't exist
-    path.parent.mkdir(parents=True, exist_ok=True)
+    parent = path.parent
+    parent.mkdir(parents=True, exist_ok=True)
+    parent_str = str(parent)
 
     with tempfile.NamedTemporaryFile(
         mode=(binary and 'wb') or 'w',
-        dir=str(path.parent),
+        dir=parent_str,
         delete=False,
     ) as temp_fh:
-        yield temp_fh
-        temp_fh.flush()
-        os.fsync(temp_fh.fileno())
+        try:
+            yield temp_fh
+            temp_fh.flush()
+            os.fsync(temp_fh.fileno())
+        except BaseException:
+            temp_fh.close()
+            with contextlib.suppress(Exception):
+                os.remove(temp_fh.name)
+            raise
 
     try:
-        os.rename(temp_fh.name, path)
-    finally:
+        # Unlike `os.rename`, `os.replace` is atomic on Windows as well
+        os.replace(temp_fh.name, path)
+    except BaseException:
         with contextlib.suppress(Exception):
             os.remove(temp_fh.name)
+        raise
+
+    if os.name != 'nt':  # pragma: not-nt
+        # Sync the directory as well so the rename itself is persisted, not
+        # all filesystems support this so it is best effort only
+        with contextlib.suppress(OSError):
+            dir_fd = os.open(parent_str, os.O_RDONLY | os.O_DIRECTORY)
+            try:
+                os.fsync(dir_fd)
+            finally:
+                os.close(dir_fd)
 
 
 class LockBase(abc.ABC):  # pragma: no cover
@@ -948,12 +1112,15 @@ class LockBase(abc.ABC):  # pragma: no cover
         check_interval: float | None = None,
         fail_when_locked: bool | None = None,
     ) -> None:
-        self.timeout = coalesce(timeout, DEFAULT_TIMEOUT)
-        self.check_interval = coalesce(check_interval, DEFAULT_CHECK_INTERVAL)
-        self.fail_when_locked = coalesce(
-            fail_when_locked,
-            DEFAULT_FAIL_WHEN_LOCKED,
-        )
+        if timeout is None:
+            timeout = DEFAULT_TIMEOUT
+        self.timeout = timeout
+        if check_interval is None:
+            check_interval = DEFAULT_CHECK_INTERVAL
+        self.check_interval = check_interval
+        if fail_when_locked is None:
+            fail_when_locked = DEFAULT_FAIL_WHEN_LOCKED
+        self.fail_when_locked = fail_when_locked
 
     @abc.abstractmethod
     def acquire(
@@ -968,20 +1135,41 @@ class LockBase(abc.ABC):  # pragma: no cover
         timeout: float | None,
         check_interval: float | None,
     ) -> typing.Iterator[int]:
-        f_timeout = coalesce(timeout, self.timeout, 0.0)
-        f_check_interval = coalesce(check_interval, self.check_interval, 0.0)
+        # `__init__` already made sure these attributes are not None
+        f_timeout = self.timeout if timeout is None else timeout
+        f_check_interval = (
+            self.check_interval if check_interval is None else check_interval
+        )
 
         yield 0
         i = 0
 
-        start_time = time.perf_counter()
-        while start_time + f_timeout > time.perf_counter():
+        # Local names for the loop below
+        perf_counter = time.perf_counter
+        sleep = time.sleep
+        jitter = _random.random
+        # A positive `check_interval` below the default minimum lowers the
+        # floor as well, so sub-millisecond intervals are honoured. Zero or
+        # less keeps the default floor instead of busy looping.
+        min_check_interval = DEFAULT_MIN_CHECK_INTERVAL
+        if 0 < f_check_interval < min_check_interval:
+            min_check_interval = f_check_interval
+
+        deadline = perf_counter() + f_timeout
+        while deadline > perf_counter():
             i += 1
             yield i
 
-            # Take low lock checks into account to stay within the interval
-            since_start_time = time.perf_counter() - start_time
-            time.sleep(max(0.001, (i * f_check_interval) - since_start_time))
+            # Back off exponentially up to `check_interval`. The jitter keeps
+            # multiple waiters from all retrying at the same moment.
+            delay = min_check_interval * (1 << min(i, 10)) * (0.5 + jitter())
+            delay = max(min_check_interval, min(f_check_interval, delay))
+            # Never sleep past the deadline
+            remaining = deadline - perf_counter()
+            if delay > remaining:
+                delay = remaining
+            if delay > 0:
+                sleep(delay)
 
     @abc.abstractmethod
     def release(self) -> None: ...
@@ -1010,7 +1198,11 @@ class Lock(LockBase):
         mode: the open mode, 'a' or 'ab' should be used for writing. When mode
             contains `w` the file will be truncated to 0 bytes.
         timeout: timeout when trying to acquire a lock
-        check_interval: check interval while waiting
+        check_interval: the longest wait between attempts while waiting. The
+            waits start short and back off up to this value. Positive values
+            below `DEFAULT_MIN_CHECK_INTERVAL` (1ms) are honoured, zero or
+            less waits at least 1ms between attempts. Pass 0.001 to keep a
+            1ms floor.
         fail_when_locked: after the initial lock failed, return an error
             or lock the file. This does not wait for the timeout.
         **file_open_kwargs: The kwargs for the `open(...)` call
@@ -1031,6 +1223,8 @@ class Lock(LockBase):
     check_interval: float
     fail_when_locked: bool
     flags: LockFlags
+    #: `flags` does not contain `NON_BLOCKING`, derived once from `flags`
+    _should_block: bool
     file_open_kwargs: dict[str, typing.Any]
 
     def __init__(
@@ -1049,9 +1243,10 @@ class Lock(LockBase):
         else:
             truncate = False
 
+        should_block = not (flags & LockFlags.NON_BLOCKING)
         if timeout is None:
             timeout = DEFAULT_TIMEOUT
-        elif not (flags & LockFlags.NON_BLOCKING):
+        elif should_block:
             warnings.warn(
                 'timeout has no effect in blocking mode',
                 stacklevel=1,
@@ -1062,6 +1257,7 @@ class Lock(LockBase):
         self.mode = mode
         self.truncate = truncate
         self.flags = flags
+        self._should_block = should_block
         self.file_open_kwargs = file_open_kwargs
         super().__init__(timeout, check_interval, fail_when_locked)
 
@@ -1073,68 +1269,89 @@ class Lock(LockBase):
     ) -> typing.IO[typing.AnyStr]:
         """Acquire the locked filehandle"""
 
-        fail_when_locked = coalesce(fail_when_locked, self.fail_when_locked)
+        # If we already have a filehandle, return it before doing anything
+        # else
+        fh = self.fh
+        if fh is not None:
+            # Due to type invariance the type checker needs an ignore here
+            return fh  # type: ignore[return-value]
+
+        if fail_when_locked is None:
+            fail_when_locked = self.fail_when_locked
 
-        if (
-            not (self.flags & LockFlags.NON_BLOCKING)
-            and timeout is not None
-        ):
+        if self._should_block and timeout is not None:
             warnings.warn(
                 'timeout has no effect in blocking mode',
                 stacklevel=1,
             )
 
-        # If we already have a filehandle, return it
-        fh = self.fh
-        if fh:
-            # Due to type invariance we need to cast the type
-            return typing.cast(typing.IO[typing.AnyStr], fh)
-
         # Get a new filehandler
         fh = self._get_fh()
 
-        def try_close() -> None:  # pragma: no cover
-            # Silently try to close the handle if possible, ignore all issues
-            if fh is not None:
-                with contextlib.suppress(Exception):
-                    fh.close()
+        attempts: typing.Iterable[int]
+        if self._should_block and not _RETRY_BLOCKING:
+            # A blocking lock already waits in the kernel until the file is
+            # released, polling would only add sleeps and wakeups
+            attempts = (0,)
+        else:
+            attempts = self._timeout_generator(timeout, check_interval)
 
         exception = None
-        # Try till the timeout has passed
-        for _ in self._timeout_generator(timeout, check_interval):
-            exception = None
-            try:
-                # Try to lock
-                fh = self._get_lock(fh)
-                break
-            except LockException as exc:
-                # Python will automatically remove the variable from memory
-                # unless you save it in a different location
-                exception = exc
-
-                # We already tried to the get the lock
-                # If fail_when_locked is True, stop trying
-                if fail_when_locked:
-                    try_close()
-                    raise AlreadyLocked(exception) from exc
-            except Exception as exc:
-                # Something went wrong with the locking mechanism.
-                # Wrap in a LockException and re-raise:
-                try_close()
-                raise LockException(exc) from exc
-
-            # Wait a bit
-
-        if exception:
-            try_close()
-            # We got a timeout... reraising
-            raise exception
+        try:
+            if (
+                not self._should_block
+                and not fail_when_locked
+                and (self.timeout if timeout is None else timeout) > 0
+            ):
+                # Retry right away a few times first, a lock that is only
+                # held for a moment is usually free again sooner than the
+                # shortest sleep
+                for _ in range(DEFAULT_SPIN_COUNT):
+                    try:
+                        fh = self._get_lock(fh)
+                    except LockException:
+                        continue
+                    except Exception as exc:
+                        raise LockException(exc) from exc
+                    # Locked, skip the retry loop
+                    attempts = ()
+                    break
+
+            # Try till the timeout has passed
+            for _ in attempts:
+                exception = None
+                try:
+                    # Try to lock
+                    fh = self._get_lock(fh)
+                    break
+                except LockException as exc:
+                    # Python will automatically remove the variable from
+                    # memory unless you save it in a different location
+                    exception = exc
+
+                    # We already tried to the get the lock
+                    # If fail_when_locked is True, stop trying
+                    if fail_when_locked:
+                        raise AlreadyLocked(exception) from exc
+                except Exception as exc:
+                    # Something went wrong with the locking mechanism.
+                    # Wrap in a LockException and re-raise:
+                    raise LockException(exc) from exc
+
+            if exception:
+                # We got a timeout... reraising
+                raise exception
+        except BaseException:
+            # Close the handle on every failure, including a
+            # KeyboardInterrupt while waiting for the lock
+            _silent_close(fh)
+            raise
 
         # Prepare the filehandle (truncate if needed)
         fh = self._prepare_fh(fh)
 
         self.fh = fh
-        return typing.cast(typing.IO[typing.AnyStr], fh)
+        return fh  # type: ignore[return-value]
 
     def __enter__(self) -> typing.IO[typing.AnyStr]:
         return self.acquire()
@@ -1148,13 +1365,10 @@ class Lock(LockBase):
 
     def _get_fh(self) -> IO:
         """Get a new filehandle"""
-        return typing.cast(
-            IO,
-            open(  # noqa: SIM115
-                self.filename,
-                self.mode,
-                **self.file_open_kwargs,
-            ),
+        return open(  # noqa: SIM115
+            self.filename,
+            self.mode,
+            **self.file_open_kwargs,
         )
 
     def _get_lock(self, fh: IO) -> IO:
@@ -1184,6 +1398,10 @@ class RLock(Lock):
     A reentrant lock, functions in a similar way to threading.RLock in that it
     can be acquired multiple times.  When the corresponding number of release()
     calls are made the lock will finally release the underlying file lock.
+
+    Threads sharing an instance wait for each other while one of them is
+    acquiring the file lock. That wait counts towards the acquire timeout,
+    `AlreadyLocked` is raised when it runs out.
     """
 
     def __init__(
@@ -1204,6 +1422,9 @@ class RLock(Lock):
             flags,
         )
         self._acquire_count = 0
+        # Guards `_acquire_count` and the transitions of the file lock when
+        # the instance is shared between threads
+        self._count_lock = threading.Lock()
 
     def acquire(
         self,
@@ -1211,24 +1432,57 @@ class RLock(Lock):
         check_interval: float | None = None,
         fail_when_locked: bool | None = None,
     ) -> typing.IO[typing.AnyStr]:
-        fh: typing.IO[typing.AnyStr]
-        if self._acquire_count >= 1:
-            fh = typing.cast(typing.IO[typing.AnyStr], self.fh)
+        if fail_when_locked is None:
+            fail_when_locked = self.fail_when_locked
+
+        if not self._should_block:
+            remaining = max(0.0, self.timeout if timeout is None else timeout)
+            deadline = time.perf_counter() + remaining
+
+        # Another thread may hold the count lock for as long as it takes to
+        # get the file lock, so only wait for it within the timeout
+        wait: float
+        if fail_when_locked:
+            # The file lock only gets a single attempt, so does this one
+            wait = 0.0
+        elif self._should_block or remaining >= threading.TIMEOUT_MAX:
+            # Blocking flags wait for the file without a timeout as well,
+            # and `Lock.acquire` rejects timeouts above `TIMEOUT_MAX`
+            wait = -1.0
         else:
-            fh = super().acquire(timeout, check_interval, fail_when_locked)
-        self._acquire_count += 1
-        assert fh is not None
-        return fh
+            wait = remaining
 
-    def release(self) -> None:
-        if self._acquire_count == 0:
-            raise LockException(
-                'Cannot release more times than acquired',
+        if not self._count_lock.acquire(timeout=wait):
+            raise AlreadyLocked(
+                'Timed out waiting for another thread using this lock',
+            )
+        try:
+            if self._acquire_count:
+                # Reentry, the file is already locked
+                self._acquire_count += 1
+                return self.fh  # type: ignore[return-value]
+
+            if not self._should_block:
+                # Only spend what is left of the timeout on the file lock
+                timeout = max(0.0, deadline - time.perf_counter())
+            fh: typing.IO[typing.AnyStr] = super().acquire(
+                timeout, check_interval, fail_when_locked
             )
+            self._acquire_count = 1
+            return fh
+        finally:
+            self._count_lock.release()
 
-        if self._acquire_count == 1:
-            super().release()
-        self._acquire_count -= 1
+    def release(self) -> None:
+        with self._count_lock:
+            if self._acquire_count == 0:
+                raise LockException(
+                    'Cannot release more times than acquired',
+                )
+
+            if self._acquire_count == 1:
+                super().release()
+            self._acquire_count -= 1
 
 
 class TemporaryFileLock(Lock):
@@ -1251,8 +1505,14 @@ class TemporaryFileLock(Lock):
         atexit.register(self.release)
 
     def release(self) -> None:
+        if self.fh is None:
+            # Not locked, e.g. the `atexit` call after an explicit release.
+            # Skip the unlink so a lock file created by someone else since
+            # is left alone.
+            return
+
         Lock.release(self)
-        if os.path.isfile(self.filename):  # pragma: no branch
+        with contextlib.suppress(FileNotFoundError):
             os.unlink(self.filename)
 
 
@@ -1289,6 +1549,10 @@ class BoundedSemaphore(LockBase):
         self.filename_pattern = filename_pattern
         self.directory = directory
         self.lock: Lock | None = None
+        # Lock objects per filename, reused between `try_lock` attempts
+        self._locks: dict[Filename, Lock] = {}
+        # Cached result of `get_filenames`
+        self._filenames: list[pathlib.Path] | None = None
         super().__init__(
             timeout=timeout,
             check_interval=check_interval,
@@ -1304,7 +1568,11 @@ class BoundedSemaphore(LockBase):
             )
 
     def get_filenames(self) -> typing.Sequence[pathlib.Path]:
-        return [self.get_filename(n) for n in range(self.maximum)]
+        if self._filenames is None:
+            self._filenames = [
+                self.get_filename(n) for n in range(self.maximum)
+            ]
+        return self._filenames
 
     def get_random_filenames(self) -> typing.Sequence[pathlib.Path]:
         filenames = list(self.get_filenames())
@@ -1312,9 +1580,12 @@ class BoundedSemaphore(LockBase):
         return filenames
 
     def get_filename(self, number: int) -> pathlib.Path:
-        return pathlib.Path(self.directory) / self.filename_pattern.format(
-            name=self.name,
-            number=number,
+        # Join as strings, a single `Path` is cheaper than `Path / str`
+        return pathlib.Path(
+            os.path.join(
+                self.directory,
+                self.filename_pattern.format(name=self.name, number=number),
+            )
         )
 
     def acquire(  # type: ignore[override]
@@ -1325,37 +1596,88 @@ class BoundedSemaphore(LockBase):
     ) -> Lock | None:
         assert not self.lock, 'Already locked'
 
-        filenames = self.get_filenames()
+        filenames = list(self.get_filenames())
+        shuffle = _random.shuffle
 
         for n in self._timeout_generator(timeout, check_interval):  # pragma:
+            # Probe the slots in a different order on every attempt so
+            # competing processes do not all start at the first slot
+            shuffle(filenames)
             logger.debug('trying lock (attempt %d) %r', n, filenames)
             # no branch
             if self.try_lock(filenames):  # pragma: no branch
                 return self.lock  # pragma: no cover
 
-        if fail_when_locked := coalesce(
-            fail_when_locked,
-            self.fail_when_locked,
-        ):
+        if fail_when_locked is None:
+            fail_when_locked = self.fail_when_locked
+        if fail_when_locked:
             raise AlreadyLocked()
 
         return None
 
     def try_lock(self, filenames: typing.Sequence[Filename]) -> bool:
         filename: Filename
+        locks = self._locks
         for filename in filenames:
             logger.debug('trying lock for %r', filename)
-            self.lock = Lock(filename, fail_when_locked=True)
-            try:
-                self.lock.acquire()
-            except AlreadyLocked:
-                self.lock = None
-            else:
+            lock = locks.get(filename)
+            if lock is None:
+                lock = locks[filename] = Lock(filename, fail_when_locked=True)
+            if self._try_slot(lock):
                 logger.debug('locked %r', filename)
+                self.lock = lock
                 return True
 
         return False
 
+    def _try_slot(self, candidate: Lock) -> bool:
+        """Try to lock the file of `candidate` using a bare file descriptor
+
+        Slots that are taken are the common case while probing, so the file
+        object is only built once the lock has been acquired.
+        """
+        fd = os.open(
+            candidate.filename,
+            os.O_WRONLY | os.O_CREAT | os.O_APPEND | _O_BINARY,
+            0o666,
+        )
+        try:
+            lock(fd, candidate.flags)
+        except LockException:
+            # Any lock failure skips this slot, like `Lock.acquire` with
+            # `fail_when_locked` turning it into `AlreadyLocked`
+            os.close(fd)
+            return False
+        except Exception as exc:
+            os.close(fd)
+            raise LockException(exc) from exc
+        except BaseException:
+            os.close(fd)
+            raise
+
+        # Once `open` calls the opener the file object owns `fd` and closes
+        # it on failure, before that the fd is still ours to close
+        taken: list[int] = []
+
+        def opener(path: str, flags: int) -> int:
+            taken.append(fd)
+            return fd
+
+        try:
+            candidate.fh = open(  # noqa: SIM115
+                candidate.filename,
+                candidate.mode,
+                opener=opener,
+                **candidate.file_open_kwargs,
+            )
+        except BaseException:
+            if not taken:
+                with contextlib.suppress(Exception):
+                    unlock(fd)
+                os.close(fd)
+            raise
+        return True
+
     def release(self) -> None:  # pragma: no cover
         if self.lock is not None:
             self.lock.release()
@@ -1373,7 +1695,7 @@ class NamedBoundedSemaphore(BoundedSemaphore):
 
     Because this works across multiple processes it's important to give the
     semaphore a name.  This name is used to create the lock files.  If you
-    don't specify a name, a random name will be generated.  This means that
+    don't specify a name, a unique name will be generated.  This means that
     you can't use the same semaphore in multiple processes unless you pass the
     semaphore object to the other processes.
 
@@ -1398,7 +1720,7 @@ class NamedBoundedSemaphore(BoundedSemaphore):
         fail_when_locked: bool | None = True,
     ) -> None:
         if name is None:
-            name = f'bounded_semaphore.{random.randint(0, 1000000):d}'
+            name = f'bounded_semaphore.{uuid.uuid4().hex}'
         super().__init__(
             maximum,
             name,